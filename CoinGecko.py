@@ -1,10 +1,19 @@
 import time
+import math
+import asyncio
+import threading
+import aiohttp
+import orjson
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+import numpy as np
 import pandas as pd
 import streamlit as st
-import plotly.express as px
+import plotly.graph_objects as go
 from datetime import datetime
-from typing import List
+from functools import lru_cache
+from typing import Any, Callable, Dict, List, Tuple
 
 # ---------------------------------------
 # CONFIGURASI DASHBOARD
@@ -32,7 +41,7 @@ with st.sidebar:
     vs_currency = st.selectbox("Mata Uang", ["usd", "idr", "eur", "btc"], index=0)
     interval = st.slider("Interval Update (detik)", 20, 120, 45, step=5)
     show_chart = st.checkbox("Tampilkan grafik harga", True)
-    chart_days = st.selectbox("Rentang waktu grafik (hari)", [1, 7, 14, 30], index=0)
+    chart_days = st.selectbox("Rentang waktu grafik (hari)", [1, 7, 14, 30, 90], index=0)
 
     st.divider()
     st.info("💡 Gunakan Coin ID sesuai CoinGecko, contoh: `bitcoin`, `ethereum`, `dogecoin`.")
@@ -40,129 +49,261 @@ with st.sidebar:
 # ---------------------------------------
 # ⚙️ UTILITAS
 # ---------------------------------------
-@st.cache_data(ttl=60)
+@st.cache_resource
+def _inflight_registry() -> Tuple[threading.Lock, Dict[Tuple, Tuple[threading.Event, Dict[str, Any]]]]:
+    """Registry request yang sedang berjalan, dibagi ke semua sesi"""
+    return threading.Lock(), {}
+
+REQUEST_TIMEOUT = 10  # detik, berlaku untuk connect dan read tiap percobaan
+RETRY_TOTAL = 3
+RETRY_BACKOFF = 0.3
+# Batas tunggu follower = waktu terlama leader: semua percobaan habis timeout + jeda backoff
+SINGLE_FLIGHT_TIMEOUT = (RETRY_TOTAL + 1) * 2 * REQUEST_TIMEOUT + sum(
+    RETRY_BACKOFF * 2 ** i for i in range(RETRY_TOTAL)
+)
+
+def _single_flight(key: Tuple, fn: Callable[[], Any]) -> Any:
+    """Gabungkan panggilan API yang identik dan bersamaan menjadi satu request"""
+    lock, inflight = _inflight_registry()
+    with lock:
+        entry = inflight.get(key)
+        is_leader = entry is None
+        if is_leader:
+            entry = (threading.Event(), {})
+            inflight[key] = entry
+    event, outcome = entry
+
+    if not is_leader:
+        # Jangan kirim request sendiri (tidak ter-coalesce); biarkan pemanggil memakai data lama
+        if not event.wait(timeout=SINGLE_FLIGHT_TIMEOUT):
+            raise TimeoutError(f"Menunggu request {key[0]} yang sedang berjalan terlalu lama")
+        if "error" in outcome:
+            raise outcome["error"]
+        return outcome["result"]
+
+    try:
+        outcome["result"] = fn()
+        return outcome["result"]
+    except BaseException as e:
+        outcome["error"] = e
+        raise
+    finally:
+        with lock:
+            inflight.pop(key, None)
+        event.set()
+
+@st.cache_resource
+def _http_session() -> requests.Session:
+    """Session HTTP bersama (keep-alive, connection pool, retry untuk 429/5xx)"""
+    session = requests.Session()
+    session.mount("https://", HTTPAdapter(
+        pool_connections=10,
+        pool_maxsize=20,
+        # Retry-After dari 429 diabaikan agar kegagalan muncul dalam beberapa detik (lalu fallback data lama)
+        max_retries=Retry(
+            total=RETRY_TOTAL,
+            backoff_factor=RETRY_BACKOFF,
+            status_forcelist=[429, 500, 502, 503, 504],
+            respect_retry_after_header=False,
+        ),
+    ))
+    return session
+
+@st.cache_data(ttl=300)
 def ping_api() -> float:
-    """Cek konektivitas ke API CoinGecko"""
+    """Cek konektivitas ke API CoinGecko (tanpa retry; gagal -> exception, tidak di-cache)"""
     start = time.time()
-    try:
-        r = requests.get("https://api.coingecko.com/api/v3/ping", timeout=30)
-        r.raise_for_status()
-        return time.time() - start
-    except requests.RequestException:
-        return -1
+    r = requests.get("https://api.coingecko.com/api/v3/ping", timeout=5)
+    r.raise_for_status()
+    return time.time() - start
 
-@st.cache_data(ttl=30)
-def fetch_market_data(vs_currency: str, coins: List[str]) -> pd.DataFrame:
-    """Ambil data pasar koin"""
+DISPLAY_COLUMNS = [
+    "symbol", "name", "current_price",
+    "price_change_percentage_1h_in_currency",
+    "price_change_percentage_24h_in_currency",
+    "price_change_percentage_7d_in_currency",
+    "high_24h", "low_24h", "ath",
+    "market_cap", "total_volume",
+    "market_cap_rank", "fully_diluted_valuation",
+    "last_updated"
+]
+NEEDED_KEYS = ["id", *DISPLAY_COLUMNS, "sparkline_in_7d"]
+NESTED_COLUMNS = ["sparkline_in_7d"]
+FLOAT32_COLUMNS = [
+    "price_change_percentage_1h_in_currency",
+    "price_change_percentage_24h_in_currency",
+    "price_change_percentage_7d_in_currency",
+]
+
+def _to_arrow_dtypes(df: pd.DataFrame) -> pd.DataFrame:
+    """Konversi kolom skalar ke dtype pyarrow (persentase float32, rank int32)"""
+    nested = [c for c in NESTED_COLUMNS if c in df.columns]
+    df = df.drop(columns=nested).convert_dtypes(dtype_backend="pyarrow").join(df[nested])
+    df = df.astype({c: "float32[pyarrow]" for c in FLOAT32_COLUMNS if c in df.columns})
+    if "market_cap_rank" in df.columns:
+        df["market_cap_rank"] = df["market_cap_rank"].astype("int32[pyarrow]")
+    return df
+
+def _fetch_market_data(vs_currency: str, coins: Tuple[str, ...], sparkline: bool) -> pd.DataFrame:
+    """Ambil data pasar koin (opsional dengan sparkline 7 hari)"""
     url = "https://api.coingecko.com/api/v3/coins/markets"
     params = {
         "vs_currency": vs_currency,
         "ids": ",".join(coins),
         "price_change_percentage": "1h,24h,7d",
     }
-    r = requests.get(url, params=params, timeout=10)
-    r.raise_for_status()
-    return pd.DataFrame(r.json())
+    if sparkline:
+        params["sparkline"] = "true"
 
-@st.cache_data(ttl=120)
-def fetch_market_chart(coin_id: str, vs_currency: str, days: int = 1) -> pd.DataFrame:
-    """Ambil data historis harga untuk grafik"""
+    def _request() -> pd.DataFrame:
+        r = _http_session().get(url, params=params, timeout=REQUEST_TIMEOUT)
+        r.raise_for_status()
+        rows = [{k: d.get(k) for k in NEEDED_KEYS} for d in orjson.loads(r.content)]
+        return _to_arrow_dtypes(pd.DataFrame(rows, columns=NEEDED_KEYS))
+
+    return _single_flight(("markets", vs_currency, coins, sparkline), _request)
+
+@st.cache_resource
+def _market_cache() -> Callable[[str, Tuple[str, ...], bool, int], pd.DataFrame]:
+    """LRU in-process untuk data pasar, hidup lintas rerun tanpa pickle st.cache_data"""
+    @lru_cache(maxsize=16)
+    def _fetch_market_cached(vs_currency: str, coins: Tuple[str, ...], sparkline: bool, bucket: int) -> pd.DataFrame:
+        return _fetch_market_data(vs_currency, coins, sparkline)
+    return _fetch_market_cached
+
+def fetch_market_data(vs_currency: str, coins: List[str], sparkline: bool = False) -> pd.DataFrame:
+    """Ambil data pasar koin, di-cache per slot waktu 30 detik"""
+    return _market_cache()(vs_currency, tuple(coins), sparkline, int(time.time() // 30))
+
+def _chart_frame(prices: list) -> pd.DataFrame:
+    """Ubah array `prices` CoinGecko menjadi DataFrame grafik"""
+    arr = np.asarray(prices, dtype=np.float64).reshape(-1, 2)
+    ts = arr[:, 0].astype("int64").view("datetime64[ms]")
+    price = arr[:, 1].astype(np.float32)
+    return pd.DataFrame({"timestamp": ts, "price": price})
+
+async def _fetch_chart(
+    session: aiohttp.ClientSession, coin_id: str, vs_currency: str, days: int
+) -> Tuple[str, pd.DataFrame]:
+    """Ambil data historis harga satu koin (async)"""
     url = f"https://api.coingecko.com/api/v3/coins/{coin_id}/market_chart"
     params = {"vs_currency": vs_currency, "days": days}
     try:
-        r = requests.get(url, params=params, timeout=10)
-        r.raise_for_status()
-        prices = r.json().get("prices", [])
-        df = pd.DataFrame(prices, columns=["timestamp_ms", "price"])
-        df["timestamp"] = pd.to_datetime(df["timestamp_ms"], unit="ms")
-        return df
+        async with session.get(url, params=params) as r:
+            r.raise_for_status()
+            payload = orjson.loads(await r.read())
+        return coin_id, _chart_frame(payload.get("prices", []))
     except Exception:
-        return pd.DataFrame(columns=["timestamp", "price"])
+        return coin_id, pd.DataFrame(columns=["timestamp", "price"])
 
-# ---------------------------------------
-# HELPER STYLING
-# ---------------------------------------
-def color_delta(val):
-    if pd.isna(val):
-        return ""
-    color = "green" if val > 0 else "red"
-    return f"color: {color}; font-weight: bold;"
+async def _fetch_all_charts(
+    coins: Tuple[str, ...], vs_currency: str, days: int
+) -> Dict[str, pd.DataFrame]:
+    """Ambil grafik semua koin secara paralel"""
+    connector = aiohttp.TCPConnector(limit=8)
+    timeout = aiohttp.ClientTimeout(total=10)
+    async with aiohttp.ClientSession(connector=connector, timeout=timeout) as session:
+        results = await asyncio.gather(
+            *[_fetch_chart(session, coin, vs_currency, days) for coin in coins]
+        )
+    return dict(results)
 
-# ---------------------------------------
-# STATUS API
-# ---------------------------------------
-ping_time = ping_api()
-if ping_time < 0:
-    st.error("🚨 Tidak bisa terhubung ke CoinGecko API.")
-else:
-    st.success(f"✅ API aktif ({ping_time:.2f}s)")
+def sparkline_charts(df: pd.DataFrame, days: int) -> Dict[str, pd.DataFrame]:
+    """Bangun data grafik dari sparkline 7 hari (titik per jam) hasil /coins/markets"""
+    charts = {}
+    for coin_id, sparkline, last_updated in zip(
+        df["id"].to_numpy(), df["sparkline_in_7d"].to_numpy(), df["last_updated"].to_numpy()
+    ):
+        prices = np.asarray((sparkline or {}).get("price") or [], dtype=np.float64)
+        end = pd.to_datetime(last_updated, utc=True)
+        if pd.isna(end):
+            end = pd.Timestamp.now(tz="UTC")
+        timestamps = pd.date_range(
+            end=end.tz_localize(None), periods=len(prices), freq="h"
+        ).to_numpy()
+        n_points = days * 24
+        charts[coin_id] = pd.DataFrame(
+            {"timestamp": timestamps[-n_points:], "price": prices[-n_points:]}
+        )
+    return charts
 
-# ---------------------------------------
-# AMBIL DATA PASAR
-# ---------------------------------------
-try:
-    df = fetch_market_data(vs_currency, coins)
-except Exception as e:
-    st.error(f"Gagal mengambil data dari API: {e}")
-    st.stop()
+@st.cache_data(ttl=120)
+def fetch_all_charts(coins: Tuple[str, ...], vs_currency: str, days: int = 1) -> Dict[str, pd.DataFrame]:
+    """Ambil data historis harga untuk grafik (semua koin sekaligus)"""
+    return _single_flight(
+        ("market_chart", vs_currency, tuple(coins), days),
+        lambda: asyncio.run(_fetch_all_charts(coins, vs_currency, days)),
+    )
 
-if df.empty:
-    st.warning("⚠️ Tidak ada data ditemukan. Periksa ID coin dan koneksi internet.")
-    st.stop()
+def _lttb(x: np.ndarray, y: np.ndarray, n_out: int) -> np.ndarray:
+    """Indeks titik hasil downsampling Largest-Triangle-Three-Buckets"""
+    n = len(x)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+    xf = x.astype(np.int64).astype(np.float64) if x.dtype.kind == "M" else x.astype(np.float64)
+    yf = y.astype(np.float64)
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.int64)
+    idx = np.empty(n_out, dtype=np.int64)
+    idx[0], idx[-1] = 0, n - 1
+    a = 0
+    for i in range(n_out - 2):
+        start, end = edges[i], edges[i + 1]
+        next_end = edges[i + 2] if i + 2 < len(edges) else n
+        avg_x = xf[end:next_end].mean()
+        avg_y = yf[end:next_end].mean()
+        area = np.abs(
+            (xf[a] - avg_x) * (yf[start:end] - yf[a])
+            - (xf[a] - xf[start:end]) * (avg_y - yf[a])
+        )
+        a = start + int(area.argmax())
+        idx[i + 1] = a
+    return idx
 
-# ---------------------------------------
-# PILIH KOLOM
-# ---------------------------------------
-columns_display = [
-    "symbol", "name", "current_price", 
-    "price_change_percentage_1h_in_currency",
-    "price_change_percentage_24h_in_currency",
-    "price_change_percentage_7d_in_currency",
-    "high_24h", "low_24h", "ath",
-    "market_cap", "total_volume",
-    "market_cap_rank", "fully_diluted_valuation",
-    "last_updated"
-]
+def downsample_chart(x: np.ndarray, y: np.ndarray, n_out: int = 500) -> Tuple[np.ndarray, np.ndarray]:
+    """Kurangi titik grafik panjang dengan LTTB agar ringan di-render"""
+    idx = _lttb(x, y, n_out)
+    return x[idx], y[idx]
 
-df_display = df[columns_display].copy()
-df_display.rename(columns={
-    "symbol": "Symbol",
-    "name": "Coin",
-    "current_price": f"Price ({vs_currency.upper()})",
-    "price_change_percentage_1h_in_currency": "1H %",
-    "price_change_percentage_24h_in_currency": "24H %",
-    "price_change_percentage_7d_in_currency": "7D %",
-    "high_24h": "24H High",
-    "low_24h": "24H Low",
-    "ath": "All Time High",
-    "market_cap": "Market Cap",
-    "total_volume": "Volume 24H",
-    "market_cap_rank": "Rank",
-    "fully_diluted_valuation": "FDV",
-    "last_updated": "Last Update"
-}, inplace=True)
+LARGE_SERIES_POINTS = 1000
+
+def build_price_figure(coin: str, vs_currency: str, days: int, data: pd.DataFrame) -> go.Figure:
+    """Bangun figure Plotly untuk grafik harga satu koin (WebGL hanya untuk seri panjang)"""
+    x = data["timestamp"].to_numpy()
+    y = data["price"].to_numpy(dtype=np.float32)
+    # Browser membatasi ~16 konteks WebGL per halaman, jadi seri pendek tetap memakai SVG
+    trace = go.Scattergl if len(x) > LARGE_SERIES_POINTS else go.Scatter
+    if len(x) > LARGE_SERIES_POINTS:
+        x, y = downsample_chart(x, y)
+    fig = go.Figure(trace(x=x, y=y, mode="lines"))
+    fig.update_layout(
+        title=f"{coin.upper()} ({vs_currency.upper()}) - {days} Hari",
+        height=300,
+        margin=dict(l=20, r=20, t=40, b=10),
+    )
+    return fig
 
 # ---------------------------------------
-# RINGKASAN METRIC CARD
+# HELPER STYLING
 # ---------------------------------------
-st.subheader("📊 Ringkasan Harga")
-cols = st.columns(min(len(df), 4))
-for i, (_, r) in enumerate(df.iterrows()):
-    with cols[i % len(cols)]:
-        delta_24h = r["price_change_percentage_24h_in_currency"]
-        st.metric(
-            label=f"{r['name']} ({r['symbol'].upper()})",
-            value=f"{r['current_price']:,} {vs_currency.upper()}",
-            delta=f"{delta_24h:.2f}%" if pd.notna(delta_24h) else "—",
+DELTA_COLUMNS = ["1H %", "24H %", "7D %"]
+
+def _delta_styles(df_display: pd.DataFrame) -> pd.DataFrame:
+    """CSS hijau/merah untuk kolom persentase, dihitung sekali dengan numpy"""
+    style_df = pd.DataFrame("", index=df_display.index, columns=df_display.columns)
+    for c in DELTA_COLUMNS:
+        v = df_display[c].to_numpy(dtype=float, na_value=np.nan)
+        style_df[c] = np.where(
+            v > 0, "color: green; font-weight: bold;",
+            np.where(v < 0, "color: red; font-weight: bold;", ""),
         )
+    return style_df
 
-# ---------------------------------------
-# TABEL DETAIL
-# ---------------------------------------
-st.markdown("### 📋 Detail Pasar")
-st.dataframe(
-    df_display.style.format({
-        f"Price ({vs_currency.upper()})": "{:,.4f}",
+@st.cache_data(ttl=30)
+def render_table_html(_df_display: pd.DataFrame, table_key: str, price_col: str) -> str:
+    """Render tabel detail pasar ke HTML (di-cache per hash data numerik)"""
+    style_df = _delta_styles(_df_display)
+    return _df_display.style.apply(lambda _: style_df, axis=None).format({
+        price_col: "{:,.4f}",
         "1H %": "{:.2f}",
         "24H %": "{:.2f}",
         "7D %": "{:.2f}",
@@ -172,44 +313,157 @@ st.dataframe(
         "Market Cap": "{:,.0f}",
         "Volume 24H": "{:,.0f}",
         "FDV": "{:,.0f}",
-    }).applymap(color_delta, subset=["1H %", "24H %", "7D %"]),
-    use_container_width=True,
-    height=520,
-)
+    }, na_rep="—", escape="html").to_html()
 
 # ---------------------------------------
-# GRAFIK HARGA
+# STATUS API
 # ---------------------------------------
-if show_chart:
-    st.markdown("### 📈 Grafik Harga")
-    for coin in coins:
-        data = fetch_market_chart(coin, vs_currency, chart_days)
-        if data.empty:
-            st.warning(f"Tidak ada data grafik untuk {coin}.")
-            continue
-        fig = px.line(
-            data, x="timestamp", y="price",
-            title=f"{coin.upper()} ({vs_currency.upper()}) - {chart_days} Hari",
-            height=300
-        )
-        fig.update_layout(margin=dict(l=20, r=20, t=40, b=10))
-        st.plotly_chart(fig, use_container_width=True)
+# Fetch pasar yang baru saja berhasil sudah membuktikan koneksi, ping cukup dilewati
+last_fetch_age = time.time() - st.session_state.get("last_market_fetch", float("-inf"))
+if last_fetch_age <= 120:
+    st.success(f"✅ API aktif (fetch terakhir {last_fetch_age:.0f}s lalu)")
+else:
+    try:
+        ping_time = ping_api()
+    except requests.RequestException:
+        ping_time = -1
+    if ping_time < 0:
+        st.error("🚨 Tidak bisa terhubung ke CoinGecko API.")
+    else:
+        st.success(f"✅ API aktif ({ping_time:.2f}s)")
 
 # ---------------------------------------
-# AUTO REFRESH (Fallback Aman)
+# DASHBOARD (FRAGMENT)
 # ---------------------------------------
-st.divider()
-st.info(f"🔄 Dashboard akan memperbarui otomatis setiap {interval} detik.")
+# Hanya bagian ini yang di-rerun setiap interval; sidebar, judul, dan ping tidak ikut dieksekusi ulang
+@st.fragment(run_every=f"{interval}s")
+def render_dashboard(coins: List[str], vs_currency: str, show_chart: bool, chart_days: int, interval: int) -> None:
+    """Ringkasan harga, tabel detail, grafik, serta indikator dan penghitung auto refresh"""
+    # ---------------------------------------
+    # AMBIL DATA PASAR
+    # ---------------------------------------
+    use_sparkline = show_chart and chart_days <= 7
+    market_key = (vs_currency, tuple(coins), use_sparkline)
+    try:
+        df = fetch_market_data(vs_currency, coins, use_sparkline)
+    except Exception as e:
+        # Stale-while-error: tetap tampilkan data terakhir yang berhasil untuk pengaturan yang sama
+        if st.session_state.get("_last_market_key") != market_key:
+            st.error(f"Gagal mengambil data dari API: {e}")
+            return
+        df = st.session_state._last_market_df
+        st.toast("⏳ Memakai data terakhir — CoinGecko sedang membatasi request atau tidak tersedia.")
+    else:
+        st.session_state._last_market_df = df
+        st.session_state._last_market_key = market_key
+        st.session_state.last_market_fetch = time.time()
+
+    if df.empty:
+        st.warning("⚠️ Tidak ada data ditemukan. Periksa ID coin dan koneksi internet.")
+        return
+
+    # ---------------------------------------
+    # KOLOM TAMPILAN
+    # ---------------------------------------
+    df_display = df.loc[:, DISPLAY_COLUMNS].rename(columns={
+        "symbol": "Symbol",
+        "name": "Coin",
+        "current_price": f"Price ({vs_currency.upper()})",
+        "price_change_percentage_1h_in_currency": "1H %",
+        "price_change_percentage_24h_in_currency": "24H %",
+        "price_change_percentage_7d_in_currency": "7D %",
+        "high_24h": "24H High",
+        "low_24h": "24H Low",
+        "ath": "All Time High",
+        "market_cap": "Market Cap",
+        "total_volume": "Volume 24H",
+        "market_cap_rank": "Rank",
+        "fully_diluted_valuation": "FDV",
+        "last_updated": "Last Update"
+    })
+
+    # ---------------------------------------
+    # RINGKASAN METRIC CARD
+    # ---------------------------------------
+    st.subheader("📊 Ringkasan Harga")
+    cols = st.columns(min(len(df), 4))
+    for i, (name, symbol, price, delta_24h) in enumerate(zip(
+        df["name"].to_numpy(),
+        df["symbol"].to_numpy(),
+        df["current_price"].to_numpy(dtype=float, na_value=np.nan),
+        df["price_change_percentage_24h_in_currency"].to_numpy(dtype=float, na_value=np.nan),
+    )):
+        with cols[i % len(cols)]:
+            st.metric(
+                label=f"{name} ({symbol.upper()})",
+                value=f"{price:,} {vs_currency.upper()}",
+                delta=f"{delta_24h:.2f}%" if not math.isnan(delta_24h) else "—",
+            )
+
+    # ---------------------------------------
+    # TABEL DETAIL
+    # ---------------------------------------
+    st.markdown("### 📋 Detail Pasar")
+    price_col = f"Price ({vs_currency.upper()})"
+    table_key = str(pd.util.hash_pandas_object(
+        df_display.drop(columns="Last Update"), index=False
+    ).sum())
+    st.markdown(
+        f'<div style="max-height: 520px; overflow: auto;">'
+        f'{render_table_html(df_display, table_key, price_col)}</div>',
+        unsafe_allow_html=True,
+    )
+
+    # ---------------------------------------
+    # GRAFIK HARGA
+    # ---------------------------------------
+    # Figure disimpan per sesi dan slot 120 detik, jadi rerun fragment tidak membangun ulang grafik
+    fig_keys = set()
+    if show_chart:
+        st.markdown("### 📈 Grafik Harga")
+        bucket = int(time.time() // 120)
+        charts = None
+        for coin in coins:
+            key = f"fig::{coin}::{vs_currency}::{chart_days}::{bucket}"
+            fig = st.session_state.get(key)
+            if fig is None:
+                if charts is None:
+                    if use_sparkline:
+                        charts = sparkline_charts(df, chart_days)
+                    else:
+                        charts = fetch_all_charts(tuple(coins), vs_currency, chart_days)
+                data = charts.get(coin)
+                if data is None or data.empty:
+                    st.warning(f"Tidak ada data grafik untuk {coin}.")
+                    continue
+                fig = build_price_figure(coin, vs_currency, chart_days, data)
+                st.session_state[key] = fig
+            fig_keys.add(key)
+            st.plotly_chart(fig, use_container_width=True)
 
-progress = st.progress(0)
-for i in range(interval):
-    progress.progress((i + 1) / interval)
-    time.sleep(1)
+    # Grafik dimatikan berarti fig_keys kosong, sehingga semua figure lama ikut dibuang
+    for key in [k for k in st.session_state if k.startswith("fig::") and k not in fig_keys]:
+        del st.session_state[key]
 
-# Fallback untuk versi lama dan baru
-try:
-    st.experimental_rerun()  # Akan dipakai jika masih ada di versi lama
-except AttributeError:
-    st.rerun()  # Dipakai di Streamlit versi baru
+    # ---------------------------------------
+    # AUTO REFRESH
+    # ---------------------------------------
+    st.session_state.refresh_count = st.session_state.get("refresh_count", 0) + 1
+    refresh_count = st.session_state.refresh_count
 
+    st.divider()
+    st.info(f"🔄 Dashboard akan memperbarui otomatis setiap {interval} detik.")
+
+    st.markdown(
+        f"""
+        <style>
+        @keyframes refresh-progress-{refresh_count} {{ from {{ width: 0%; }} to {{ width: 100%; }} }}
+        .refresh-progress {{ height: 0.5rem; border-radius: 0.25rem; background: rgba(151, 166, 195, 0.25); overflow: hidden; }}
+        .refresh-progress > div {{ height: 100%; background: #ff4b4b; animation: refresh-progress-{refresh_count} {interval}s linear forwards; }}
+        </style>
+        <div class="refresh-progress"><div></div></div>
+        """,
+        unsafe_allow_html=True,
+    )
 
+render_dashboard(coins, vs_currency, show_chart, chart_days, interval)